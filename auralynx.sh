@@ -15,8 +15,9 @@ Usage:
   export AAI_API_KEY="your_assemblyai_api_here"
       - Set your AssemblyAI API key before using any commands.
 
-  ./auralynx.sh transcribe <audio.mp3> [--model <name>]
-      - Transcribe audio file and save output as <audio>_alynx.json.
+  ./auralynx.sh transcribe <audio.mp3> [more.mp3 ...] [--model <name>] [--workers <n>]
+      - Transcribe audio file(s) and save each output as <audio>_alynx.json.
+        Several files are transcribed in parallel.
         Default model: universal
 
   ./auralynx.sh parse <json_file>
@@ -38,6 +39,7 @@ Models:
 Examples:
   ./auralynx.sh transcribe song.mp3
   ./auralynx.sh transcribe song.mp3 --model universal
+  ./auralynx.sh transcribe song1.mp3 song2.mp3 song3.mp3
   ./auralynx.sh parse song_alynx.json
   ./auralynx.sh parse-lrc song_alynx.json
   ./auralynx.sh auto song.mp3
@@ -51,14 +53,24 @@ transcribe() {
         exit 1
     fi
     
-    audio="$1"
-    shift
+    # audio files come first, options after
+    audio_files=()
+    while [ $# -gt 0 ] && [[ "$1" != -* ]]; do
+        audio_files+=("$1")
+        shift
+    done
     extra_args=("$@")
-    base_name="${audio%.*}"
-    out_json="${base_name}_alynx.json"
 
-    echo "Transcribing: ${audio} -> ${out_json}"
-    python "$SCRIPT_DIR/src/auralynx/auralynx_core_api.py" "$audio" "${extra_args[@]}" --output "$out_json"
+    # --output is single-file only; with several files the core API
+    # already writes each one to <audio>_alynx.json
+    if [ ${#audio_files[@]} -eq 1 ]; then
+        out_json="${audio_files[0]%.*}_alynx.json"
+        echo "Transcribing: ${audio_files[0]} -> ${out_json}"
+        extra_args+=(--output "$out_json")
+    else
+        echo "Transcribing ${#audio_files[@]} files"
+    fi
+    python "$SCRIPT_DIR/src/auralynx/auralynx_core_api.py" "${audio_files[@]}" "${extra_args[@]}"
     return $?
 }
 
@@ -7,16 +7,59 @@ Auralynx Core API wrapper for AssemblyAI
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
+import hashlib
+import math
 import sys
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from argparse import ArgumentParser
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson else json.loads
+
+def _json_dumps(obj):
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
 UPLOAD_URL = "https://api.assemblyai.com/v2/upload"
 TRANSCRIPT_URL = "https://api.assemblyai.com/v2/transcript"
 
-CHUNK_SIZE = 5242880  # 5 MB
+# 16 MB by default; override with AURALYNX_CHUNK_SIZE or --chunk-size
+CHUNK_SIZE = 16 * 1024 * 1024
+PREFETCH_CHUNKS = 4  # chunks read ahead while the previous ones are being sent
+# upload bytes held in memory across all parallel workers (in-memory bodies
+# and prefetched chunks); each worker gets an equal share
+PARALLEL_UPLOAD_MEMORY = 128 * 1024 * 1024
+# files below this size are read in one go and sent as a single body;
+# override with AURALYNX_SMALL_UPLOAD_THRESHOLD
+SMALL_UPLOAD_THRESHOLD = 64 * 1024 * 1024
+
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "auralynx")
+UPLOAD_CACHE_FILE = os.path.join(CACHE_DIR, "uploads.json")
+# AssemblyAI deletes uploaded files after about a day; keep a safety margin
+UPLOAD_CACHE_TTL = 23 * 60 * 60
+
+def env_int(name, default, exit_code):
+    # read in main(), so a bad value gives a clean error instead of an import-time traceback
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        print(f"ERROR: {name} must be an integer number of bytes, got {value!r}")
+        sys.exit(exit_code)
 
 def get_api_key():
     key = os.environ.get("AAI_API_KEY")
@@ -26,135 +69,264 @@ def get_api_key():
         sys.exit(2)
     return key
 
-def upload_file(audio_file, api_key):
-    print(f"Uploading {audio_file} ...")
-    headers = {"authorization": api_key}
+_job = threading.local()
+_print_lock = threading.Lock()
+# set on Ctrl-C so workers stuck in a poll wait stop instead of running on
+_cancel = threading.Event()
+
+def log(msg):
+    """print() that tags the line with the current file when several run in parallel."""
+    label = getattr(_job, "label", None)
+    with _print_lock:
+        print(f"[{label}] {msg}" if label else msg)
+
+def create_session(api_key, pool_size=4):
+    """One keep-alive session for all API calls, with retries on 5xx for GETs."""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504], raise_on_status=False)
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry))
+    session.headers["authorization"] = api_key
+    return session
+
+def read_chunks_prefetched(f, chunk_size=CHUNK_SIZE, depth=PREFETCH_CHUNKS):
+    """Yield chunks of f, read on a background thread so disk reads overlap socket sends."""
+    chunks = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def reader():
+        try:
+            while not stop.is_set():
+                chunk = f.read(chunk_size)
+                chunks.put(chunk)
+                if not chunk:
+                    break
+        except Exception as e:
+            chunks.put(e)
+
+    threading.Thread(target=reader, daemon=True).start()
     try:
-        with open(audio_file, "rb") as f:
-            def gen():
-                while True:
-                    chunk = f.read(CHUNK_SIZE)
-                    if not chunk:
-                        break
-                    yield chunk
-            resp = requests.post(UPLOAD_URL, headers=headers, data=gen(), timeout=120)
+        while True:
+            chunk = chunks.get()
+            if isinstance(chunk, Exception):
+                raise chunk
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        # unblock the reader if it is waiting on a full queue
+        stop.set()
+        while not chunks.empty():
+            chunks.get_nowait()
+
+def upload_file(audio_file, session, chunk_size=CHUNK_SIZE, small_upload_threshold=SMALL_UPLOAD_THRESHOLD,
+                prefetch_depth=PREFETCH_CHUNKS):
+    log(f"Uploading {audio_file} ...")
+    try:
+        with open(audio_file, "rb", buffering=chunk_size) as f:
+            if os.fstat(f.fileno()).st_size < small_upload_threshold:
+                # fits comfortably in memory: one Content-Length body, no generator churn
+                body = f.read()
+            else:
+                if hasattr(os, "posix_fadvise"):
+                    # hint the kernel to read ahead aggressively
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                body = read_chunks_prefetched(f, chunk_size, prefetch_depth)
+            # No os.sendfile() here: UPLOAD_URL is HTTPS and the TLS layer has to
+            # encrypt every byte in userspace, so the kernel can't splice file
+            # pages to the socket (ssl sockets fall back to send() anyway).
+            try:
+                resp = session.post(UPLOAD_URL, data=body, timeout=120)
+            finally:
+                # stop the prefetch thread and drop its queued chunks even if
+                # the request failed halfway through the body
+                if not isinstance(body, bytes):
+                    body.close()
     except FileNotFoundError:
-        print(f"ERROR: File not found: {audio_file}")
+        log(f"ERROR: File not found: {audio_file}")
         sys.exit(3)
     except PermissionError:
-        print(f"ERROR: Permission denied: {audio_file}")
+        log(f"ERROR: Permission denied: {audio_file}")
         sys.exit(15)
     except IOError as e:
-        print(f"ERROR: Cannot read file: {e}")
+        log(f"ERROR: Cannot read file: {e}")
         sys.exit(16)
     except requests.RequestException as e:
-        print(f"ERROR: Upload request failed: {e}")
+        log(f"ERROR: Upload request failed: {e}")
         sys.exit(4)
 
     if resp.status_code not in (200, 201):
-        print(f"ERROR: Upload failed ({resp.status_code}): {resp.text}")
+        log(f"ERROR: Upload failed ({resp.status_code}): {resp.text}")
         sys.exit(5)
 
     try:
-        upload_url = resp.json().get("upload_url")
+        upload_url = _json_loads(resp.content).get("upload_url")
     except json.JSONDecodeError:
-        print("ERROR: Invalid JSON response from upload API")
+        log("ERROR: Invalid JSON response from upload API")
         sys.exit(17)
     
     if not upload_url:
-        print("ERROR: No upload_url returned by API.")
+        log("ERROR: No upload_url returned by API.")
         sys.exit(6)
 
-    print(f"Uploaded to: {upload_url}")
+    log(f"Uploaded to: {upload_url}")
     return upload_url
 
-def request_transcript(audio_url, api_key, options=None):
-    print("Requesting transcription...")
+def file_sha256(path):
+    # hashlib goes through OpenSSL, which uses SHA-NI where the CPU has it
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_upload_cache():
+    try:
+        with open(UPLOAD_CACHE_FILE, "rb") as f:
+            cache = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def upload_cache_key(api_key, digest):
+    # scoped by account: an upload made with one API key isn't usable with another
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16] + ":" + digest
+
+def _upload_entry_fresh(entry, now):
+    return (isinstance(entry, dict) and isinstance(entry.get("uploaded_at"), (int, float))
+            and now - entry["uploaded_at"] < UPLOAD_CACHE_TTL)
+
+def lookup_upload_cache(key):
+    entry = load_upload_cache().get(key)
+    if not _upload_entry_fresh(entry, time.time()):
+        return None
+    return entry.get("url")
+
+_upload_cache_lock = threading.Lock()
+
+def _update_upload_cache(update):
+    # best effort: a broken cache must never fail the transcription
+    with _upload_cache_lock:
+        now = time.time()
+        cache = {k: v for k, v in load_upload_cache().items() if _upload_entry_fresh(v, now)}
+        update(cache)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(UPLOAD_CACHE_FILE, "w", encoding="utf-8") as f:
+                json.dump(cache, f, indent=2)
+        except OSError as e:
+            log(f"Warning: Could not update upload cache: {e}")
+
+def store_upload_cache(key, upload_url):
+    _update_upload_cache(lambda cache: cache.update({key: {"url": upload_url, "uploaded_at": time.time()}}))
+
+def drop_upload_cache(key):
+    _update_upload_cache(lambda cache: cache.pop(key, None))
+
+def request_transcript(audio_url, session, options=None):
+    # an upload still in flight at Ctrl-C must not start a billed job
+    if _cancel.is_set():
+        log("Cancelled.")
+        sys.exit(130)
+    log("Requesting transcription...")
     # debug/validation
     if not isinstance(audio_url, str) or not audio_url.startswith("https://"):
-        print(f"ERROR: Invalid audio_url passed to request_transcript: {audio_url!r}")
+        log(f"ERROR: Invalid audio_url passed to request_transcript: {audio_url!r}")
         sys.exit(21)
 
     data = {"audio_url": audio_url}
     if options:
         data.update(options)
 
+    # encode once: the same bytes are printed and sent
+    body = _json_dumps(data)
+
     # debug: show payload about to be sent
-    print("DEBUG: transcript request payload =", json.dumps(data, ensure_ascii=False))
+    log(f"DEBUG: transcript request payload = {body.decode('utf-8')}")
     
-    headers = {
-        "authorization": api_key,
-        "content-type": "application/json"
-    }
-
     try:
-        resp = requests.post(TRANSCRIPT_URL, json=data, headers=headers, timeout=180)
+        resp = session.post(TRANSCRIPT_URL, data=body, headers={"content-type": "application/json"}, timeout=180)
     except requests.RequestException as e:
-        print(f"ERROR: Transcript request failed: {e}")
+        log(f"ERROR: Transcript request failed: {e}")
         sys.exit(7)
 
     if resp.status_code not in (200, 201):
-        print(f"ERROR: Transcript request failed ({resp.status_code}): {resp.text}")
+        log(f"ERROR: Transcript request failed ({resp.status_code}): {resp.text}")
         sys.exit(8)
 
     try:
-        transcript_id = resp.json().get("id")
+        transcript_id = _json_loads(resp.content).get("id")
     except json.JSONDecodeError:
-        print("ERROR: Invalid JSON response from transcript API")
+        log("ERROR: Invalid JSON response from transcript API")
         sys.exit(18)
     
     if not transcript_id:
-        print("ERROR: No transcript id returned.")
+        log("ERROR: No transcript id returned.")
         sys.exit(9)
 
-    print(f"Transcript ID: {transcript_id}")
+    log(f"Transcript ID: {transcript_id}")
     return transcript_id
 
-def poll_transcript(transcript_id, api_key, timeout=300, poll_interval=3):
+def poll_transcript(transcript_id, session, timeout=300, poll_interval=1.0, max_interval=10.0):
     url = f"{TRANSCRIPT_URL}/{transcript_id}"
-    headers = {"authorization": api_key}
-    start_time = time.time()
-    print("Waiting for transcription to complete...")
+    start_time = time.monotonic()
+    # exponential backoff: short jobs are picked up quickly, long ones polled less often
+    interval = poll_interval
+    log("Waiting for transcription to complete...")
     while True:
         try:
-            resp = requests.get(url, headers=headers, timeout=30)
+            resp = session.get(url, timeout=30)
         except requests.RequestException as e:
-            print(f"ERROR: Polling request failed: {e}")
+            log(f"ERROR: Polling request failed: {e}")
             sys.exit(10)
 
         if resp.status_code != 200:
-            print(f"ERROR: Poll failed ({resp.status_code}): {resp.text}")
+            log(f"ERROR: Poll failed ({resp.status_code}): {resp.text}")
             sys.exit(11)
 
         try:
-            result = resp.json()
+            result = _json_loads(resp.content)
         except json.JSONDecodeError:
-            print("ERROR: Invalid JSON response from polling API")
+            log("ERROR: Invalid JSON response from polling API")
             sys.exit(19)
         
         status = result.get("status", "unknown")
         if status == "completed":
-            print("Transcription completed.")
+            log("Transcription completed.")
             return result
         if status == "error":
-            print(f"ERROR: Transcription error: {result.get('error', 'unknown')}")
+            log(f"ERROR: Transcription error: {result.get('error', 'unknown')}")
             sys.exit(12)
 
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         if elapsed > timeout:
-            print(f"ERROR: Transcription timed out after {timeout} seconds.")
+            log(f"ERROR: Transcription timed out after {timeout} seconds.")
             sys.exit(13)
 
-        print(f"Status: {status}. Elapsed: {int(elapsed)}s. Polling again in {poll_interval}s...")
-        time.sleep(poll_interval)
+        wait = interval
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after:
+            try:
+                retry_after = float(retry_after)
+            except ValueError:
+                retry_after = None  # HTTP-date form, keep our own interval
+            if retry_after is not None and math.isfinite(retry_after):
+                wait = max(interval, retry_after)
+        # never sleep past the overall timeout
+        wait = max(0.0, min(wait, timeout - elapsed))
+
+        log(f"Status: {status}. Elapsed: {int(elapsed)}s. Polling again in {wait:.1f}s...")
+        if _cancel.wait(wait):
+            log("Cancelled.")
+            sys.exit(130)
+        interval = min(interval * 1.5, max_interval)
 
 def parse_words(transcript_data, model_name=None):
     words = transcript_data.get("words", [])
     if not words:
        if model_name == "slam-1":
-         print("Warning: This model is still in beta stage")
+         log("Warning: This model is still in beta stage")
        else:
-         print("Warning: No word-level data found in transcript.")
+         log("Warning: No word-level data found in transcript.")
     return words
 
 def save_output(audio_file, transcript_result, words, output_file):
@@ -168,20 +340,120 @@ def save_output(audio_file, transcript_result, words, output_file):
         }
     }
     try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(out, f, indent=2, ensure_ascii=False)
+        if orjson:
+            with open(output_file, "wb") as f:
+                f.write(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+        else:
+            # json.dump() issues one small write per token; encode once instead
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(json.dumps(out, indent=2, ensure_ascii=False))
     except Exception as e:
-        print(f"ERROR: Failed to write output file: {e}")
+        log(f"ERROR: Failed to write output file: {e}")
         sys.exit(14)
-    print(f"Saved output to: {output_file}")
+    log(f"Saved output to: {output_file}")
+
+def print_preview(words, audio_file=None):
+    # printed as one block so previews from parallel jobs don't interleave
+    title = "WORD-LEVEL PREVIEW (first 30 words)"
+    if audio_file:
+        title += f" - {audio_file}"
+    lines = ["=" * 60, title, "=" * 60]
+    for w in words[:30]:
+        start = w.get("start", 0) / 1000
+        end = w.get("end", 0) / 1000
+        text = w.get("text", "")
+        lines.append(f"{start:6.2f}s - {end:6.2f}s : {text}")
+    lines.append(f"... total words: {len(words)}")
+    with _print_lock:
+        print("\n".join(lines))
+
+def transcribe_file(audio_file, output_file, session, api_key, args, transcript_options, show_name=False):
+    _job.label = audio_file if show_name else None
+    try:
+        _transcribe_file(audio_file, output_file, session, api_key, args, transcript_options, show_name)
+    finally:
+        _job.label = None
+
+def _transcribe_file(audio_file, output_file, session, api_key, args, transcript_options, show_name):
+    # skip the upload when the same file content was already uploaded
+    cache_key = None
+    if not args.no_upload_cache:
+        try:
+            cache_key = upload_cache_key(api_key, file_sha256(audio_file))
+        except OSError:
+            pass  # upload_file reports unreadable files
+    upload_url = lookup_upload_cache(cache_key) if cache_key else None
+    if upload_url:
+        log(f"Using cached upload: {upload_url}")
+        try:
+            transcript_id = request_transcript(upload_url, session, options=transcript_options)
+            result = poll_transcript(transcript_id, session, timeout=args.timeout)
+        except SystemExit as e:
+            # 8: request rejected, 12: transcription error; the cached upload
+            # has most likely expired, so forget it and upload once more
+            if e.code not in (8, 12):
+                raise
+            log("Cached upload failed, uploading again...")
+            drop_upload_cache(cache_key)
+            upload_url = None
+
+    if not upload_url:
+        upload_url = upload_file(audio_file, session, chunk_size=args.chunk_size,
+                                 small_upload_threshold=args.small_upload_threshold,
+                                 prefetch_depth=args.prefetch_depth)
+        transcript_id = request_transcript(upload_url, session, options=transcript_options)
+        result = poll_transcript(transcript_id, session, timeout=args.timeout)
+        # only remember uploads the service actually transcribed
+        if cache_key:
+            store_upload_cache(cache_key, upload_url)
+
+    words = parse_words(result, args.model)
+    save_output(audio_file, result, words, output_file)
+
+    # print a brief preview
+    print_preview(words, audio_file if show_name else None)
 
 def main():
     parser = ArgumentParser(description="Auralynx: Transcribe audio with AssemblyAI")
-    parser.add_argument("audio_file", help="Path to audio file (mp3/wav/m4a)")
-    parser.add_argument("--output", "-o", help="Output json filename (default: <audio>_alynx.json)")
+    parser.add_argument("audio_file", nargs="+", help="Path to audio file(s) (mp3/wav/m4a)")
+    parser.add_argument("--output", "-o", help="Output json filename, single file only (default: <audio>_alynx.json)")
     parser.add_argument("--timeout", type=int, default=300, help="Polling timeout in seconds (default 300)")
     parser.add_argument("--model", default="universal", help="Change speech-to-text model")
+    parser.add_argument("--chunk-size", type=int, help=f"Upload chunk size in bytes (default $AURALYNX_CHUNK_SIZE or {CHUNK_SIZE})")
+    parser.add_argument("--no-upload-cache", action="store_true", help="Always upload, even if this file was uploaded before")
+    parser.add_argument("--workers", type=int, default=8, help="Files transcribed in parallel (default 8)")
     args = parser.parse_args()
+
+    if args.chunk_size is None:
+      args.chunk_size = env_int("AURALYNX_CHUNK_SIZE", CHUNK_SIZE, 22)
+    if args.chunk_size <= 0:
+      print(f"ERROR: Invalid chunk size: {args.chunk_size}")
+      sys.exit(22)
+
+    args.small_upload_threshold = env_int("AURALYNX_SMALL_UPLOAD_THRESHOLD", SMALL_UPLOAD_THRESHOLD, 27)
+    if args.small_upload_threshold < 0:
+      print(f"ERROR: Invalid AURALYNX_SMALL_UPLOAD_THRESHOLD: {args.small_upload_threshold}")
+      sys.exit(27)
+    args.prefetch_depth = PREFETCH_CHUNKS
+
+    if args.workers <= 0:
+      print(f"ERROR: Invalid worker count: {args.workers}")
+      sys.exit(23)
+
+    audio_files = args.audio_file
+    if args.output and len(audio_files) > 1:
+      print("ERROR: --output can only be used with a single audio file")
+      sys.exit(24)
+
+    # song.mp3 and song.wav would both write song_alynx.json
+    output_files = [args.output or (os.path.splitext(f)[0] + "_alynx.json") for f in audio_files]
+    seen = {}
+    for audio_file, output_file in zip(audio_files, output_files):
+      key = os.path.abspath(output_file)
+      if key in seen:
+        print(f"ERROR: {seen[key]} and {audio_file} would both be saved to {output_file}")
+        sys.exit(26)
+      seen[key] = audio_file
     
     allowed_models = ["slam-1", "universal"]
     if args.model not in allowed_models:
@@ -189,8 +461,6 @@ def main():
       sys.exit(20)
 
     api_key = get_api_key()
-    audio_file = args.audio_file
-    output_file = args.output or (os.path.splitext(audio_file)[0] + "_alynx.json")
     transcript_options = {
         # minimal options; can be extended
         "speech_model": args.model,
@@ -198,22 +468,59 @@ def main():
         "punctuate": True,
     }
 
-    upload_url = upload_file(audio_file, api_key)
-    transcript_id = request_transcript(upload_url, api_key, options=transcript_options)
-    result = poll_transcript(transcript_id, api_key, timeout=args.timeout)
-    words = parse_words(result, args.model)
-    save_output(audio_file, result, words, output_file)
+    if len(audio_files) == 1:
+        session = create_session(api_key)
+        transcribe_file(audio_files[0], output_files[0], session, api_key, args, transcript_options)
+    else:
+        # I/O-bound (upload + polling), so threads are enough; one shared
+        # session with a connection per worker
+        workers = min(args.workers, len(audio_files))
+        # every worker may hold a whole small file or a queue of chunks, so
+        # split the memory budget instead of multiplying it by the worker count
+        share = PARALLEL_UPLOAD_MEMORY // workers
+        args.small_upload_threshold = min(args.small_upload_threshold, share)
+        # a streaming upload holds the queued chunks plus one being read and
+        # one being sent; shrink the queue first, then the chunk size
+        if args.chunk_size * (PREFETCH_CHUNKS + 2) > share:
+            args.prefetch_depth = 1
+            args.chunk_size = min(args.chunk_size, share // 3)
+        session = create_session(api_key, pool_size=workers)
+        failed = []
+        # no "with": its exit would wait for every queued file after a Ctrl-C
+        pool = ThreadPoolExecutor(max_workers=workers)
+        futures = {
+            pool.submit(transcribe_file, audio_file, output_file,
+                        session, api_key, args, transcript_options, show_name=True): audio_file
+            for audio_file, output_file in zip(audio_files, output_files)
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except SystemExit:
+                    # the helpers already printed the reason
+                    failed.append(futures[future])
+                except Exception as e:
+                    # one broken file must not abort the others or lose the summary
+                    log(f"[{futures[future]}] ERROR: Unexpected error: {e!r}")
+                    failed.append(futures[future])
+        except KeyboardInterrupt:
+            _cancel.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+            cancelled = [name for fut, name in futures.items() if fut.cancelled()]
+            running = [name for fut, name in futures.items() if not fut.done()]
+            with _print_lock:
+                print("ERROR: Interrupted.")
+                if cancelled:
+                    print(f"  not started: {', '.join(cancelled)}")
+                if running:
+                    print(f"  stopped while running: {', '.join(running)}")
+            sys.exit(130)
+        pool.shutdown()
+        if failed:
+            print(f"ERROR: {len(failed)} of {len(audio_files)} files failed: {', '.join(failed)}")
+            sys.exit(25)
 
-    # print a brief preview
-    print("=" * 60)
-    print("WORD-LEVEL PREVIEW (first 30 words)")
-    print("=" * 60)
-    for w in words[:30]:
-        start = w.get("start", 0) / 1000
-        end = w.get("end", 0) / 1000
-        text = w.get("text", "")
-        print(f"{start:6.2f}s - {end:6.2f}s : {text}")
-    print(f"... total words: {len(words)}")
     print("Success.")
     print(f"using model: {args.model}")
     sys.exit(0)
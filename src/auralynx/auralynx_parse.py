@@ -10,12 +10,72 @@ Behavior:
 import json
 import sys
 import os
+import mmap
+import shelve
 from argparse import ArgumentParser
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-def load_json(json_file):
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# orjson is much faster on large, number-heavy transcripts; stdlib json is the fallback
+_json_loads = orjson.loads if orjson else json.loads
+
+# Opt-in cache of parsed transcripts for repeated runs on the same file
+PARSE_CACHE = os.environ.get("AURALYNX_PARSE_CACHE") == "1"
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "auralynx")
+PARSE_CACHE_FILE = os.path.join(CACHE_DIR, "parsed.shelf")
+
+def _cache_stamp(json_file: str) -> Tuple[int, int]:
+    st = os.stat(json_file)
+    return st.st_mtime_ns, st.st_size
+
+def load_parse_cache(json_file: str) -> Optional[Dict[str, Any]]:
+    # best effort: any cache problem just means a normal parse
+    try:
+        stamp = _cache_stamp(json_file)
+        with shelve.open(PARSE_CACHE_FILE, flag='r') as db:
+            entry = db.get(os.path.abspath(json_file))
+    except Exception:
+        return None
+    if entry is None or entry[0] != stamp:
+        return None
+    return entry[1]
+
+def store_parse_cache(json_file: str, data: Dict[str, Any]) -> None:
+    try:
+        stamp = _cache_stamp(json_file)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with shelve.open(PARSE_CACHE_FILE, protocol=5) as db:
+            db[os.path.abspath(json_file)] = (stamp, data)
+    except Exception as e:
+        print(f"WARNING: Could not update parse cache: {e}")
+
+def load_json(json_file: str) -> Dict[str, Any]:
+    if PARSE_CACHE:
+        data = load_parse_cache(json_file)
+        if data is None:
+            data = read_json(json_file)
+            store_parse_cache(json_file, data)
+        return data
+    return read_json(json_file)
+
+def read_json(json_file: str) -> Dict[str, Any]:
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(json_file, 'rb') as f:
+            # stdlib json can't parse a memoryview, and empty files can't be mapped
+            if orjson is None or os.fstat(f.fileno()).st_size == 0:
+                return _json_loads(f.read())
+            # let orjson scan the page cache directly instead of a bytes copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
     except FileNotFoundError:
         print(f"ERROR: File not found: {json_file}")
         sys.exit(2)
@@ -23,31 +83,34 @@ def load_json(json_file):
         print(f"ERROR: Failed to parse JSON: {e}")
         sys.exit(3)
 
-def format_seconds_to_lrc_ts(sec):
-    minutes = int(sec // 60)
-    seconds = sec - minutes * 60
-    return f"{minutes:02d}:{seconds:05.2f}"
+def lrc_line(start_ms: Any, text: str) -> Optional[str]:
+    text = text.strip()
+    if start_ms is None or not text:
+        return None
 
-def export_lrc(words, outpath):
-    lines = []
-    for w in words:
-        start_ms = w.get('start')
-        text = w.get('text', '').strip()
-        if start_ms is None or not text:
-            continue
-        
-        try:
-            start_s = start_ms / 1000.0
-        except (TypeError, ZeroDivisionError):
-            print(f"WARNING: Invalid timestamp for word: {text}")
-            continue
-        
-        ts = format_seconds_to_lrc_ts(start_s)
-        lines.append(f"[{ts}]{text}")
+    # split on integer ms so the seconds part never goes through a float subtraction;
+    # an invalid start is reported in the "Skipped N words" summary instead
+    try:
+        minutes, rem_ms = divmod(start_ms, 60000)
+    except TypeError:
+        return None
+
+    return f"[{int(minutes):02d}:{rem_ms / 1000.0:05.2f}]{text}"
+
+_lrc_fields = itemgetter('start', 'text')
+
+def format_lrc_line(w: Dict[str, Any]) -> Optional[str]:
+    try:
+        start_ms, text = _lrc_fields(w)
+    except KeyError:
+        start_ms, text = w.get('start'), w.get('text', '')
+    return lrc_line(start_ms, text)
+
+def write_lrc(lines: List[str], outpath: str) -> None:
     try:
-        with open(outpath, 'w', encoding='utf-8') as f:
-            for l in lines:
-                f.write(l + "\n")
+        with open(outpath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            if lines:
+                f.write("\n".join(lines) + "\n")
     except PermissionError:
         print(f"ERROR: Permission denied writing to: {outpath}")
         sys.exit(6)
@@ -56,7 +119,60 @@ def export_lrc(words, outpath):
         sys.exit(4)
     print(f"LRC exported to: {outpath}")
 
-def auralynx_parse(json_file, export_lrc_flag=False, lrc_out=None):
+def export_lrc(words: Iterable[Dict[str, Any]], outpath: str) -> None:
+    lines = [l for l in map(format_lrc_line, words) if l is not None]
+    write_lrc(lines, outpath)
+
+def ms_to_seconds(starts_ms: List[float], ends_ms: List[float]) -> Tuple[List[float], List[float], List[float]]:
+    """Convert millisecond timestamps to (starts, ends, durations) in seconds."""
+    starts = [s / 1000 for s in starts_ms]
+    ends = [e / 1000 for e in ends_ms]
+    return starts, ends, [e - s for s, e in zip(starts, ends)]
+
+def word_fields(words: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Any, Any, str]]:
+    """Yield (start_ms, end_ms, text) for each word; missing timestamps are None."""
+    get_fields = itemgetter('start', 'end', 'text')
+    for w in words:
+        try:
+            yield get_fields(w)
+        except KeyError:
+            yield w.get('start'), w.get('end'), w.get('text', '')
+
+def timed_columns(fields: List[Tuple[Any, Any, str]]) -> Tuple[int, List[float], List[float], List[float], List[str]]:
+    """Return (skipped, starts, ends, durations, texts) in seconds for words with usable timestamps."""
+    # drop words without usable timestamps in one comprehension, so the
+    # formatting loops need no per-word checks
+    timed = [f for f in fields if isinstance(f[0], (int, float)) and isinstance(f[1], (int, float))]
+    starts, ends, durations = ms_to_seconds([f[0] for f in timed], [f[1] for f in timed])
+    return len(fields) - len(timed), starts, ends, durations, [f[2] for f in timed]
+
+# rows per stdout write; keeps the formatted output from piling up in memory
+OUTPUT_BATCH = 4096
+
+def batched(rows: Iterable[Any], size: int = OUTPUT_BATCH) -> Iterator[List[Any]]:
+    """Yield lists of up to size rows."""
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+def write_lines(lines: List[str]) -> None:
+    """Write a block of lines to stdout with a single write() call."""
+    if not lines:
+        return
+    text = "\n".join(lines) + "\n"
+    out = getattr(sys.stdout, 'buffer', None)
+    if out is None:
+        sys.stdout.write(text)
+        return
+    # encode the whole block once and bypass the TextIOWrapper; flush first
+    # so earlier print() output stays in order
+    sys.stdout.flush()
+    out.write(text.encode(sys.stdout.encoding or 'utf-8', sys.stdout.errors or 'strict'))
+
+def auralynx_parse(json_file: str, export_lrc_flag: bool = False, lrc_out: Optional[str] = None) -> None:
     data = load_json(json_file)
     words = data.get('words', [])
 
@@ -68,28 +184,28 @@ def auralynx_parse(json_file, export_lrc_flag=False, lrc_out=None):
         print("ERROR: 'words' field is not a list in JSON")
         sys.exit(5)
 
+    # read each word's fields once; LRC lines and the timed columns share them
+    fields = list(word_fields(words))
+
+    # LRC only needs a start time, so it is built from every word
+    lrc_lines: List[str] = []
+    if export_lrc_flag:
+        lrc_lines = [l for l in (lrc_line(start, text) for start, _, text in fields) if l is not None]
+
+    skipped, starts, ends, durations, texts = timed_columns(fields)
+    del fields
+
     # Always show timestamps
     print("=" * 60)
     print("WORD-LEVEL TIMESTAMPS")
     print("=" * 60)
-    for word in words:
-        start_ms = word.get('start')
-        end_ms = word.get('end')
-        
-        if start_ms is None or end_ms is None:
-            print(f"WARNING: Missing timestamp for word: {word.get('text', 'unknown')}")
-            continue
-        
-        try:
-            start = start_ms / 1000
-            end = end_ms / 1000
-            duration = end - start
-        except (TypeError, ZeroDivisionError):
-            print(f"WARNING: Invalid timestamp for word: {word.get('text', 'unknown')}")
-            continue
-        
-        text = word.get('text', '')
-        print(f"{start:6.2f}s - {end:6.2f}s ({duration:.2f}s) : {text}")
+    for rows in batched(zip(starts, ends, durations, texts)):
+        write_lines([
+            f"{start:6.2f}s - {end:6.2f}s ({duration:.2f}s) : {text}"
+            for start, end, duration, text in rows
+        ])
+    if skipped:
+        print(f"WARNING: Skipped {skipped} words with missing or invalid timestamps")
 
     if export_lrc_flag:
         # Export LRC (no WORD_DATA, no JSON output)
@@ -97,7 +213,7 @@ def auralynx_parse(json_file, export_lrc_flag=False, lrc_out=None):
             base = os.path.splitext(json_file)[0]
             lrc_out = base + ".lrc"
 
-        export_lrc(words, lrc_out)
+        write_lrc(lrc_lines, lrc_out)
 
         print("\n[SUCCESS] LRC export complete.")
         sys.exit(0)
@@ -106,33 +222,27 @@ def auralynx_parse(json_file, export_lrc_flag=False, lrc_out=None):
         # Default parse → show WORD_DATA
         print("\n" + "=" * 60)
         print("WORD_DATA = [")
-        for w in words:
-            start_ms = w.get('start')
-            end_ms = w.get('end')
-            
-            if start_ms is None or end_ms is None:
-                continue
-            
-            try:
-                start = start_ms / 1000
-                end = end_ms / 1000
-                duration = end - start
-            except (TypeError, ZeroDivisionError):
-                continue
-            
-            text = w.get('text', '').replace("'", "\\'")
-            print(f"    {{'word': '{text}', 'start': {start:.2f}, 'end': {end:.2f}, 'duration': {duration:.2f}}},")
+        for rows in batched(zip(starts, ends, durations, texts)):
+            word_data = []
+            for start, end, duration, text in rows:
+                text = text.replace("'", "\\'")
+                word_data.append(f"    {{'word': '{text}', 'start': {start:.2f}, 'end': {end:.2f}, 'duration': {duration:.2f}}},")
+            write_lines(word_data)
         print("]")
         print("\n[SUCCESS] Parse complete.")
         sys.exit(0)
 
-def main():
+def main() -> None:
     parser = ArgumentParser(description="Auralynx: Parse AssemblyAI JSON and optionally export LRC")
     parser.add_argument("json_file", help="AssemblyAI JSON (output from auralynx_core_api.py)")
     parser.add_argument("--lrc", action="store_true", help="Export .lrc file")
     parser.add_argument("--lrc-out", help="Custom LRC output filename")
     args = parser.parse_args()
 
+    # output is written in large blocks, no need to flush on every newline
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=False)
+
     auralynx_parse(args.json_file, export_lrc_flag=args.lrc, lrc_out=args.lrc_out)
 
 if __name__ == "__main__":